@@ -2,6 +2,9 @@
 This module provides functions to interact with an SQLite database for managing download information.
 
 Functions:
+    get_conn(database: str = app_database):
+        Context manager that yields a pooled SQLite connection.
+
     create_database_or_database_table(table_name: str) -> None:
         Creates a database and a table if they do not already exist.
 
@@ -13,95 +16,543 @@ Functions:
 """
 
 import os
+import pathlib
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+# Directory and database paths, anchored to this module rather than the
+# invoking process's working directory so the database is found no matter
+# where the app is launched from.
+database_dir = pathlib.Path(__file__).resolve().parent / ".dbs"
+database_dir.mkdir(exist_ok=True)
+app_database = str(database_dir / "app_db.db")
+
+# Pool of reusable connections per database path. Opening a connection per
+# call throws away SQLite's page cache, so connections are kept alive and
+# handed out through get_conn() instead.
+_pools: dict = {}
+
+# The closed set of tables this application uses. Table names are interpolated
+# into SQL, so anything outside this set is rejected instead of formatted in.
+ALLOWED_TABLES = ("queued_downloads", "active_downloads", "completed_downloads")
+
+_SQL_TEMPLATES = {
+    # Upsert: one B-tree descent creates or refreshes the row, so callers
+    # never need a separate existence check or update path.
+    "insert": (
+        "INSERT INTO {table} (filename, file_size, status, time_left, transfer_rate) "
+        "VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT(filename) DO UPDATE SET "
+        "file_size = excluded.file_size, status = excluded.status, "
+        "time_left = excluded.time_left, transfer_rate = excluded.transfer_rate"
+    ),
+    "select": (
+        "SELECT filename, file_size, status, time_left, transfer_rate FROM {table}"
+    ),
+}
+
+# SQL strings per (table, operation), formatted once at import so the hot path
+# does no string formatting and sqlite3's compiled-statement cache (keyed on
+# the exact SQL text) always hits.
+_sql_cache: dict = {
+    (table, operation): template.format(table=table)
+    for table in ALLOWED_TABLES
+    for operation, template in _SQL_TEMPLATES.items()
+}
+
+
+def _sql(table: str, operation: str) -> str:
+    """
+    Returns the precomputed SQL string for a (table, operation) pair.
+
+    Args:
+        table (str): The name of the table the statement targets.
+        operation (str): One of the keys in _SQL_TEMPLATES.
+
+    Returns:
+        str: The formatted SQL statement.
+
+    Raises:
+        ValueError: If the table is not one of ALLOWED_TABLES.
+    """
+    try:
+        return _sql_cache[(table, operation)]
+    except KeyError:
+        raise ValueError(f"Unknown table: {table!r}") from None
+
+
+def _make_connection(database: str, readonly: bool = False) -> sqlite3.Connection:
+    """
+    Creates a new SQLite connection for the pool.
+
+    Args:
+        database (str): The path to the SQLite database file.
+        readonly (bool, optional): Open the database in read-only mode.
+
+    Returns:
+        sqlite3.Connection: A connection usable from any thread.
+    """
+    if readonly:
+        connection = sqlite3.connect(
+            f"file:{database}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+    else:
+        connection = sqlite3.connect(
+            database, check_same_thread=False, cached_statements=256
+        )
+        # WAL avoids the rollback-journal copy/delete cycle per commit and lets
+        # readers run alongside the writer; NORMAL skips the fsync at
+        # non-critical moments. WAL is meaningless for in-memory databases.
+        if database != ":memory:":
+            connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    # Wait up to 5 s for a competing writer instead of failing immediately
+    # with SQLITE_BUSY and forcing a Python-level retry.
+    connection.execute("PRAGMA busy_timeout=5000")
+    connection.execute("PRAGMA temp_store=MEMORY")
+    connection.execute("PRAGMA cache_size=-20000")
+    # Memory-map the database file (256 MB window) to skip read() syscalls
+    # and the double-buffering between the OS page cache and SQLite's.
+    connection.execute("PRAGMA mmap_size=268435456")
+    return connection
+
+
+@contextmanager
+def get_conn(database: str = app_database, readonly: bool = False):
+    """
+    Context manager that yields a pooled SQLite connection.
+
+    The connection is taken from (or created for) the pool belonging to the
+    given database path and returned to the pool on exit, so the page cache
+    stays warm across calls. Read-only connections live in a separate pool:
+    under WAL they read snapshots without ever waiting behind the writer.
+
+    Args:
+        database (str, optional): The path to the database. Defaults to app_database.
+        readonly (bool, optional): Yield a read-only connection. Defaults to False.
+    """
+    if readonly and (database == ":memory:" or not os.path.exists(database)):
+        # mode=ro cannot create the file (and :memory: pools are private),
+        # so fall back to a regular connection.
+        readonly = False
+    pool = _pools.setdefault((database, readonly), queue.Queue())
+    try:
+        connection = pool.get_nowait()
+    except queue.Empty:
+        connection = _make_connection(database, readonly)
+    try:
+        yield connection
+    finally:
+        pool.put(connection)
+
+
+# Multipliers for the display units the legacy schema stored as text.
+_LEGACY_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
 
-# Directory and database paths
-database_dir = os.path.join(os.getcwd(), ".dbs")
-app_database = os.path.join(database_dir, "app_db.db")
+
+def _parse_legacy_size(text) -> int:
+    """
+    Converts a legacy display size like "12.34 MB" back to bytes.
+
+    Args:
+        text: The stored value; numbers pass through unchanged.
+
+    Returns:
+        int: The size in bytes, 0 when the value cannot be parsed.
+    """
+    if isinstance(text, (int, float)):
+        return int(text)
+    try:
+        value, unit = str(text).split()
+        return int(float(value) * _LEGACY_UNITS[unit.upper()])
+    except (ValueError, KeyError):
+        return 0
+
+
+def _parse_legacy_rate(text) -> float:
+    """
+    Converts a legacy display rate like "1.25 MB/s" back to bytes/second.
+
+    Args:
+        text: The stored value; numbers pass through unchanged.
+
+    Returns:
+        float: The rate in bytes per second, 0.0 when unparseable.
+    """
+    if isinstance(text, (int, float)):
+        return float(text)
+    try:
+        value, unit = str(text).split()
+        return float(value) * _LEGACY_UNITS[unit.split("/")[0].upper()]
+    except (ValueError, KeyError):
+        return 0.0
+
+
+def _parse_legacy_eta(text):
+    """
+    Converts a legacy "H:MM:SS" time-left string back to seconds.
+
+    Args:
+        text: The stored value; numbers pass through unchanged.
+
+    Returns:
+        int | None: Seconds remaining, or None for "N/A"/unparseable values.
+    """
+    if text is None or isinstance(text, (int, float)):
+        return None if text is None else int(text)
+    parts = str(text).split(":")
+    if len(parts) != 3:
+        return None
+    try:
+        hours, minutes, seconds = (int(float(part)) for part in parts)
+    except ValueError:
+        return None
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def _migrate_legacy_table(connection: sqlite3.Connection, table_name: str) -> None:
+    """
+    Rebuilds a table created by the original schema in place.
+
+    The original schema keyed rows on an AUTOINCREMENT id, put no unique
+    constraint on filename, and stored the numeric columns as display
+    strings ("12.34 MB", "0:03:21", "1.25 MB/s").  CREATE TABLE IF NOT
+    EXISTS leaves such a table untouched, after which every upsert fails
+    (no conflict target) and format_bytes chokes on the text sizes, so the
+    rows are copied into the keyed schema with the strings parsed back to
+    native numbers.  Duplicate filenames keep the most recent row.  The
+    whole rebuild runs in one transaction, so a crash mid-way leaves the
+    legacy table intact for the next attempt.
+
+    Args:
+        connection (sqlite3.Connection): An open read-write connection.
+        table_name (str): The name of the table to rebuild.
+    """
+    with connection:
+        connection.execute(f"ALTER TABLE {table_name} RENAME TO {table_name}_legacy")
+        connection.execute(
+            f"""
+        CREATE TABLE {table_name} (
+            filename TEXT PRIMARY KEY,
+            file_size INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            time_left INTEGER,
+            transfer_rate REAL
+        ) WITHOUT ROWID
+        """
+        )
+        rows = connection.execute(
+            f"SELECT filename, file_size, status, time_left, transfer_rate "
+            f"FROM {table_name}_legacy ORDER BY id"
+        ).fetchall()
+        connection.executemany(
+            _sql(table_name, "insert"),
+            [
+                (
+                    filename,
+                    _parse_legacy_size(file_size),
+                    status,
+                    _parse_legacy_eta(time_left),
+                    _parse_legacy_rate(transfer_rate),
+                )
+                for filename, file_size, status, time_left, transfer_rate in rows
+            ],
+        )
+        connection.execute(f"DROP TABLE {table_name}_legacy")
 
 
 def create_database_or_database_table(table_name: str) -> None:
     """
     Creates a database and a table if they do not already exist.
 
+    A table left behind by the original id-keyed schema is migrated to the
+    filename-keyed schema first.
+
     Args:
         table_name (str): The name of the table to create.
+
+    Raises:
+        ValueError: If the table is not one of ALLOWED_TABLES.
     """
-    connection = sqlite3.connect(app_database)
-    cursor = connection.cursor()
-    cursor.execute(
-        f"""
-    CREATE TABLE IF NOT EXISTS {table_name} (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        filename TEXT NOT NULL,
-        file_size TEXT NOT NULL,
-        status TEXT NOT NULL,
-        time_left TEXT,
-        transfer_rate TEXT
-    );
-    """
-    )
-    connection.commit()
-    connection.close()
+    if table_name not in ALLOWED_TABLES:
+        raise ValueError(f"Unknown table: {table_name!r}")
+    with get_conn() as connection:
+        # An "id" column marks the pre-keyed schema; PRAGMA table_info
+        # returns no rows when the table does not exist yet.
+        if any(
+            column[1] == "id"
+            for column in connection.execute(f"PRAGMA table_info({table_name})")
+        ):
+            _migrate_legacy_table(connection, table_name)
+        # filename is the key every lookup and delete uses, so it is the
+        # primary key; WITHOUT ROWID stores the rows directly in the
+        # primary-key B-tree, and dropping AUTOINCREMENT removes the
+        # sqlite_sequence bookkeeping write per insert. executescript runs
+        # the whole DDL batch in one parse/execute round trip.
+        connection.executescript(
+            f"""
+        BEGIN;
+        CREATE TABLE IF NOT EXISTS {table_name} (
+            filename TEXT PRIMARY KEY,
+            file_size INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            time_left INTEGER,
+            transfer_rate REAL
+        ) WITHOUT ROWID;
+        COMMIT;
+        """
+        )
 
 
-def fetch_entries_from_database(table_name: str, database=app_database):
+def iter_entries_from_database(table_name: str, database=app_database):
     """
-    Fetch all entries from a specified table in the SQLite database.
+    Iterates over the entries of a specified table in the SQLite database.
+
+    Rows are yielded straight from the cursor instead of being materialized
+    with fetchall(), so memory stays flat no matter how large the download
+    history grows. Only the display columns are selected (no id).
 
     Parameters:
         table_name (str): The name of the table to fetch entries from.
         database (str, optional): The path to the SQLite database file. Defaults to the global variable `app_database`.
 
-    Returns:
-        list: A list of tuples, where each tuple represents a row from the specified table.
+    Yields:
+        tuple: (filename, file_size, status, time_left, transfer_rate) per row.
 
     Example:
-        entries = fetch_entries_from_database('completed_downloads')
-        for entry in entries:
+        for entry in iter_entries_from_database('completed_downloads'):
             print(entry)
     """
-    connection = sqlite3.connect(database)
-    cursor = connection.cursor()
-    cursor.execute(f"SELECT * FROM {table_name}")
-    entries = cursor.fetchall()
-    connection.close()
-    return entries
+    with get_conn(database, readonly=True) as connection:
+        cursor = connection.cursor()
+        cursor.execute(_sql(table_name, "select"))
+        # Pull rows 256 at a time so the C-to-Python boundary is crossed
+        # once per batch instead of once per row.
+        cursor.arraysize = 256
+        while rows := cursor.fetchmany():
+            yield from rows
 
 
 def add_file_to_database_table(
     filename: str,
-    size: str,
+    size: int,
     status: str,
-    time_left: str,
-    transfer_rate: str,
+    time_left: int,
+    transfer_rate: float,
     table: str,
     database: str = app_database,
 ) -> None:
     """
-    Adds a file record to the specified database table.
+    Adds a file record to the specified database table, or refreshes it if a
+    record with the same filename already exists (upsert).
+
+    Numeric fields are stored natively (bytes, seconds, bytes/s); formatting
+    for display is the UI's job.
 
     Args:
         filename (str): The name of the file.
-        size (str): The size of the file.
+        size (int): The size of the file in bytes.
         status (str): The status of the download.
-        time_left (str): The time left for the download.
-        transfer_rate (str): The transfer rate of the download.
+        time_left (int): The time left for the download in seconds, or None.
+        transfer_rate (float): The transfer rate of the download in bytes/s.
         table (str): The name of the table to add the record to.
         database (str, optional): The path to the database. Defaults to app_database.
     """
-    connection = sqlite3.connect(database)
-    cursor = connection.cursor()
-    info = (filename, size, status, time_left, transfer_rate)
-    cursor.execute(
-        f"""
-    INSERT INTO {table} (filename, file_size, status, time_left, transfer_rate) 
-    VALUES (?, ?, ?, ?, ?)
-    """,
-        info,
-    )
-    connection.commit()
-    connection.close()
+    with get_conn(database) as connection, connection:
+        info = (filename, size, status, time_left, transfer_rate)
+        connection.execute(_sql(table, "insert"), info)
+
+
+# Single background worker that runs database calls off the GUI thread so a
+# slow commit (fsync) never stalls the Qt event loop. One worker is enough:
+# SQLite serializes writes anyway.
+_task_queue: "queue.Queue" = queue.Queue()
+_task_thread = None
+_task_thread_lock = threading.Lock()
+
+
+def submit_db_task(func, *args, **kwargs):
+    """
+    Runs a database function on the background worker thread.
+
+    Args:
+        func: The db_functions callable to run (e.g. add_file_to_database_table).
+        *args: Positional arguments for the callable.
+        **kwargs: Keyword arguments for the callable.
+
+    Returns:
+        concurrent.futures.Future: Resolves with the callable's result.
+    """
+    global _task_thread
+    future = Future()
+    with _task_thread_lock:
+        if _task_thread is None:
+            _task_thread = threading.Thread(target=_task_loop, daemon=True)
+            _task_thread.start()
+    _task_queue.put((future, func, args, kwargs))
+    return future
+
+
+def _task_loop() -> None:
+    """
+    Background loop that executes queued database tasks.
+    """
+    while True:
+        future, func, args, kwargs = _task_queue.get()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as exc:  # surface errors through the future
+            future.set_exception(exc)
+
+
+# Write-behind buffer for high-frequency progress updates. Progress ticks
+# arrive several times per second per download; committing each one would
+# fsync at the same rate. Updates are coalesced here (last write per
+# filename wins) and flushed in one transaction every _FLUSH_INTERVAL.
+_pending: dict = {}
+_pending_lock = threading.Lock()
+_flush_thread = None
+_FLUSH_INTERVAL = 0.25
+
+
+def queue_progress_update(
+    filename: str,
+    size: int,
+    status: str,
+    time_left: int,
+    transfer_rate: float,
+    table: str,
+    database: str = app_database,
+) -> None:
+    """
+    Queues a progress update for a file, to be flushed in the background.
+
+    Only the most recent update per (database, table, filename) is kept, so
+    any number of progress ticks collapse into at most one upsert per flush
+    (which also creates the row if it does not exist yet).
+
+    Args:
+        filename (str): The name of the file.
+        size (int): The size of the file in bytes.
+        status (str): The status of the download.
+        time_left (int): The time left for the download in seconds, or None.
+        transfer_rate (float): The transfer rate of the download in bytes/s.
+        table (str): The name of the table to update.
+        database (str, optional): The path to the database. Defaults to app_database.
+    """
+    global _flush_thread
+    with _pending_lock:
+        _pending[(database, table, filename)] = (size, status, time_left, transfer_rate)
+        if _flush_thread is None:
+            _flush_thread = threading.Thread(target=_flush_loop, daemon=True)
+            _flush_thread.start()
+
+
+def flush_pending_updates() -> None:
+    """
+    Flushes all queued progress updates to the database immediately.
+    """
+    with _pending_lock:
+        pending = _pending.copy()
+        _pending.clear()
+    if not pending:
+        return
+    grouped: dict = {}
+    for (database, table, filename), values in pending.items():
+        grouped.setdefault((database, table), []).append((filename,) + values)
+    try:
+        for (database, table), rows in grouped.items():
+            with get_conn(database) as connection, connection:
+                connection.executemany(_sql(table, "insert"), rows)
+    except sqlite3.Error:
+        # Put the batch back so a transient failure loses nothing; the
+        # upsert makes re-writing any rows that did land harmless, and
+        # setdefault keeps updates queued in the meantime as the newer ones.
+        with _pending_lock:
+            for key, values in pending.items():
+                _pending.setdefault(key, values)
+        raise
+
+
+def _flush_loop() -> None:
+    """
+    Background loop that periodically flushes queued progress updates.
+    """
+    while True:
+        time.sleep(_FLUSH_INTERVAL)
+        try:
+            flush_pending_updates()
+        except sqlite3.Error as e:
+            # The failed batch was re-queued; keep the thread alive and
+            # retry on the next interval rather than dropping updates.
+            print(f"Error: {e}")
+
+
+def add_files_to_database_table(
+    rows: list, table: str, database: str = app_database
+) -> None:
+    """
+    Adds multiple file records to the specified database table in one transaction.
+
+    SQLite commits (and fsyncs) once per transaction, so inserting a batch of
+    rows this way is far cheaper than calling add_file_to_database_table in a
+    loop.
+
+    Args:
+        rows (list): List of (filename, file_size, status, time_left, transfer_rate) tuples.
+        table (str): The name of the table to add the records to.
+        database (str, optional): The path to the database. Defaults to app_database.
+    """
+    if not rows:
+        return
+    with get_conn(database) as connection, connection:
+        connection.executemany(_sql(table, "insert"), rows)
+
+
+def move_file_between_tables(
+    filename: str, src_table: str, dst_table: str, database: str = app_database
+) -> None:
+    """
+    Moves a file record from one table to another atomically.
+
+    The insert and delete run in the same transaction, so the move costs a
+    single commit and a crash can never leave the row in both tables (or
+    neither). The insert is the usual upsert, so moving a filename the
+    destination already holds (e.g. re-downloading a completed file)
+    replaces that row instead of failing.
+
+    Args:
+        filename (str): The name of the file to move.
+        src_table (str): The table to move the record out of.
+        dst_table (str): The table to move the record into.
+        database (str, optional): The path to the database. Defaults to app_database.
+
+    Raises:
+        ValueError: If either table is not one of ALLOWED_TABLES.
+    """
+    if src_table not in ALLOWED_TABLES or dst_table not in ALLOWED_TABLES:
+        raise ValueError(f"Unknown table: {src_table!r} -> {dst_table!r}")
+    with get_conn(database) as connection, connection:
+        row = connection.execute(
+            f"SELECT filename, file_size, status, time_left, transfer_rate "
+            f"FROM {src_table} WHERE filename = ?",
+            (filename,),
+        ).fetchone()
+        if row is None:
+            return
+        connection.execute(_sql(dst_table, "insert"), row)
+        connection.execute(
+            f"DELETE FROM {src_table} WHERE filename = ?",
+            (filename,),
+        )
 
 
 def delete_files_from_database(
@@ -115,15 +566,17 @@ def delete_files_from_database(
         table (str): The name of the table to delete the records from.
         database (str, optional): The path to the database. Defaults to app_database.
     """
-    connection = sqlite3.connect(database)
-    cursor = connection.cursor()
-    for filename in filenames:
-        cursor.execute(
-            f"""
-        DELETE FROM {table} 
-        WHERE filename = ?
-        """,
-            (filename,),
-        )
-    connection.commit()
-    connection.close()
+    if table not in ALLOWED_TABLES:
+        raise ValueError(f"Unknown table: {table!r}")
+    if not filenames:
+        return
+    with get_conn(database) as connection, connection:
+        # One DELETE ... IN (...) per batch instead of one statement per
+        # filename; batches stay under SQLite's default host-parameter limit.
+        for start in range(0, len(filenames), 500):
+            batch = filenames[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            connection.execute(
+                f"DELETE FROM {table} WHERE filename IN ({placeholders})",
+                batch,
+            )
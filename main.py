@@ -4,7 +4,7 @@ main.py
 A PyQt5 application for downloading YouTube videos and audio using yt-dlp. This application allows users to select
 video formats, track download progress, and manage completed downloads.
 
-Modules: os sys time re subprocess yt_dlp datetime.timedelta PyQt5.QtCore (QTimer, QThread, pyqtSignal, QObject,
+Modules: os sys time re subprocess yt_dlp datetime.timedelta PyQt5.QtCore (QThread, pyqtSignal, QObject,
 Qt) PyQt5.QtWidgets (QApplication, QMainWindow, QMessageBox, QCheckBox, QLabel, QPushButton, QFileDialog,
 QTableWidgetItem) PyQt5.uic (loadUi) db_functions (create_database_or_database_table)
 
@@ -13,21 +13,29 @@ Classes:
     MainWindow: A QMainWindow subclass that defines the main window and user interface for the application.
 
 Functions:
-    create_db_dir(): Creates a directory named '.dbs' if it doesn't exist.
     normalize_filename(filename): Normalizes filenames by removing unwanted characters and patterns.
+    height_to_label(height): Maps a video height in pixels to a resolution label.
+    formats_from_info(info): Builds the formats dictionary from a yt-dlp info dictionary.
+    fetch_formats_with_api(url, playlist): Fetches available formats through yt-dlp's Python API.
+    fetch_formats_with_cli(url, playlist): Fetches available formats via the yt-dlp CLI (fallback).
     parse_formats(output): Parses the format output from yt-dlp to categorize audio and video formats.
     format_bytes(size): Converts bytes to a human-readable string with appropriate units.
 """
 
 import os
 import re
-import subprocess
 import sys
+import threading
 import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
+from operator import itemgetter
 
-import yt_dlp
-from PyQt5.QtCore import QTimer, QThread, pyqtSignal
+# yt_dlp and subprocess are imported lazily inside the functions that need
+# them: importing yt_dlp registers its whole extractor set, which would
+# otherwise delay the window's first paint by hundreds of milliseconds.
+from PyQt5.QtCore import QThread, pyqtSignal
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QCursor
 from PyQt5.QtWidgets import (
@@ -46,16 +54,19 @@ from PyQt5.uic import loadUi
 from db_functions import (
     create_database_or_database_table,
     add_file_to_database_table,
-    fetch_entries_from_database,
+    iter_entries_from_database,
     delete_files_from_database,
+    submit_db_task,
 )
 
+# Persistent yt-dlp cache (deciphered player JS, nsig solutions, ...) so
+# runs after the first don't re-download and re-solve base.js.
+YTDLP_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ytdlp-downloader")
 
-def create_db_dir():
-    """
-    Creates a directory named '.dbs' if it doesn't exist.
-    """
-    os.makedirs(".dbs", exist_ok=True)
+# Make sure yt-dlp's lazy extractor registry stays enabled: with the
+# override set, importing yt_dlp constructs all ~1800 extractor classes up
+# front.  Must happen before the first (lazy) yt_dlp import anywhere.
+os.environ.pop("YTDLP_NO_LAZY_EXTRACTORS", None)
 
 
 class DownloadWorker(QThread):
@@ -63,51 +74,422 @@ class DownloadWorker(QThread):
     A worker thread for downloading videos using yt-dlp.
 
     Attributes:
-        progress: Signal emitted with download progress information.
+        latest: The most recent progress dictionary from yt-dlp.
+        progress_throttled: Signal emitted with a progress dictionary at most
+            once per EMIT_INTERVAL, so the GUI does zero work when idle.
         finished: Signal emitted when the download is finished.
         error: Signal emitted if an error occurs during download.
     """
 
-    progress = pyqtSignal(dict)
+    progress_throttled = pyqtSignal(dict)
     finished = pyqtSignal(str)
     error = pyqtSignal(str)
 
-    def __init__(self, url, ydl_opts):
+    # Number of playlist entries downloaded concurrently. Network I/O
+    # releases the GIL, so threads give near-linear throughput here.
+    MAX_PLAYLIST_WORKERS = 4
+
+    # Minimum seconds between progress_throttled emissions.  250 ms keeps
+    # the bar visibly smooth while still dropping the vast majority of
+    # per-chunk hook calls before they cross the thread boundary.
+    EMIT_INTERVAL = 0.25
+
+    # The scalar fields the GUI actually renders.  Copying just these into
+    # a fresh dict per sample gives the GUI a consistent snapshot (yt-dlp
+    # mutates its hook dict in place between calls) and drops the reference
+    # to the embedded info_dict, which can run to megabytes.
+    SAMPLE_KEYS = (
+        "status",
+        "filename",
+        "downloaded_bytes",
+        "total_bytes",
+        "total_bytes_estimate",
+        "speed",
+        "eta",
+        "fragment_index",
+        "fragment_count",
+    )
+
+    def __init__(self, url, ydl_opts, info=None):
         """
         Initializes the DownloadWorker with a URL and yt-dlp options.
 
         Args:
             url (str): The URL of the video to download.
             ydl_opts (dict): Options for yt-dlp.
+            info (dict, optional): A pre-extracted info dictionary for the URL.
+                When given, the worker skips the second metadata extraction.
         """
         super().__init__()
         self.url = url
         self.ydl_opts = ydl_opts
+        self.info = info
+        self.latest = None
+        self._last_emit = 0.0
+
+    def _store_progress(self, d):
+        """
+        Progress hook that records the latest sample and occasionally
+        forwards it to the GUI.
+
+        The attribute assignment is atomic under the GIL and happens for
+        every chunk; the queued-signal emission is rate-limited so the GUI
+        thread sees at most a couple of events per second. Non-downloading
+        samples (finished/error) always go through so the final state is
+        never dropped.  Only SAMPLE_KEYS are copied out of the hook dict,
+        which yt-dlp reuses and mutates between calls.
+
+        Args:
+            d (dict): Progress information from yt-dlp.
+        """
+        sample = {key: d[key] for key in self.SAMPLE_KEYS if key in d}
+        self.latest = sample
+        now = time.monotonic()
+        if (
+            sample.get("status") != "downloading"
+            or now - self._last_emit >= self.EMIT_INTERVAL
+        ):
+            self._last_emit = now
+            self.progress_throttled.emit(sample)
 
     def run(self):
         """
         Executes the download process using yt-dlp.
         """
         try:
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                ydl.add_progress_hook(self.progress.emit)
+            if self.ydl_opts.get("noplaylist") is False:
+                self._run_playlist()
+            else:
+                self._run_single()
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def _run_playlist(self):
+        """
+        Downloads the entries of a playlist concurrently.
+
+        The playlist is first enumerated with a cheap flat extraction, then
+        each entry is downloaded on a thread pool with its own YoutubeDL
+        instance (one shared instance is not thread-safe).
+        """
+        import yt_dlp
+
+        probe_opts = dict(self.ydl_opts)
+        probe_opts["extract_flat"] = "in_playlist"
+        with yt_dlp.YoutubeDL(probe_opts) as ydl:
+            info = ydl.extract_info(self.url, download=False)
+
+        entries = [
+            entry for entry in (info.get("entries") or []) if entry and entry.get("url")
+        ]
+        if not entries:
+            self._run_single()
+            return
+
+        with ThreadPoolExecutor(max_workers=self.MAX_PLAYLIST_WORKERS) as pool:
+            futures = [
+                pool.submit(self._download_one, entry["url"]) for entry in entries
+            ]
+            for future in futures:
+                future.result()
+
+        self.finished.emit(info.get("title") or self.url)
+
+    def _download_one(self, url):
+        """
+        Downloads a single playlist entry.
+
+        Args:
+            url (str): The URL of the entry to download.
+        """
+        import yt_dlp
+
+        with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
+            ydl.add_progress_hook(self._store_progress)
+            ydl.extract_info(url, download=True)
+
+    def _run_single(self):
+        """
+        Downloads a single video or audio file.
+        """
+        import yt_dlp
+
+        with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
+            ydl.add_progress_hook(self._store_progress)
+            if self.info is not None:
+                # Reuse the metadata from the format probe instead of
+                # re-extracting (another network + player-JS round trip).
+                # process_ie_result takes the dict directly — no .info.json
+                # round trip through the filesystem.  It mutates its input,
+                # so hand it a copy and keep the cached original intact.
+                info_dict = ydl.process_ie_result(dict(self.info), download=True)
+            else:
                 info_dict = ydl.extract_info(self.url, download=True)
-                video_title = info_dict.get("title", None)
-
-                # Determine the file extension based on whether the download is audio or video
-                if "requested_formats" in info_dict:
-                    # Video and audio merged
-                    merged_filename = f"{video_title}.mp4"
-                else:
-                    # Audio only
-                    audio_extension = info_dict.get("ext", "m4a")
-                    merged_filename = f"{video_title}.{audio_extension}"
-
-                self.finished.emit(merged_filename)
+            video_title = info_dict.get("title", None)
+
+            # Determine the file extension based on whether the download is audio or video
+            if "requested_formats" in info_dict or "+" in (
+                self.ydl_opts.get("format") or ""
+            ):
+                # Video and audio merged
+                merged_filename = f"{video_title}.mp4"
+            else:
+                # Audio only
+                audio_extension = info_dict.get("ext", "m4a")
+                merged_filename = f"{video_title}.{audio_extension}"
+
+            self.finished.emit(merged_filename)
+
+
+class FormatFetchWorker(QThread):
+    """
+    Worker thread that probes the available formats for a URL.
+
+    Extraction takes seconds of network round-trips; running it here
+    keeps the window interactive, mirroring DownloadWorker.
+
+    Attributes:
+        result (pyqtSignal): Emitted with (formats, info) on success; info
+            is None when the CLI fallback produced the listing.
+        error (pyqtSignal): Emitted with an error message on failure.
+    """
+
+    result = pyqtSignal(dict, object)
+    error = pyqtSignal(str)
+
+    def __init__(self, url, playlist):
+        """
+        Initializes the worker.
+
+        Args:
+            url (str): The URL to probe.
+            playlist (bool): Whether playlist entries should be considered.
+        """
+        super().__init__()
+        self.url = url
+        self.playlist = playlist
+
+    def run(self):
+        """
+        Fetches the formats and emits result or error.
+        """
+        import subprocess
+
+        try:
+            try:
+                formats, info = fetch_formats_with_api(self.url, self.playlist)
+            except Exception:
+                # The installed yt-dlp binary may handle URLs the bundled
+                # library does not; retry through the CLI before giving up.
+                formats = fetch_formats_with_cli(self.url, self.playlist)
+                info = None
+            self.result.emit(formats, info)
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr
+            if isinstance(stderr, bytes):
+                stderr = stderr.decode("utf-8", "replace")
+            self.error.emit(stderr or str(e))
         except Exception as e:
             self.error.emit(str(e))
 
 
+# Resolution rungs for height_to_label: bisecting _HEIGHT_THRESHOLDS maps a
+# height straight to its label index, replacing a five-branch ladder.
+_HEIGHT_THRESHOLDS = (480, 720, 1080, 1440, 2160)
+_HEIGHT_LABELS = ("Low Resolution", "480p", "720p", "1080p", "2K", "4K")
+
+
+def height_to_label(height):
+    """
+    Maps a video height in pixels to a resolution label.
+
+    Args:
+        height (int): The video height in pixels.
+
+    Returns:
+        str: The resolution label, e.g. "1080p" or "4K".
+    """
+    return _HEIGHT_LABELS[bisect_right(_HEIGHT_THRESHOLDS, height)]
+
+
+# Maps the label half of a combo box entry ("fmtcode: label") back to the
+# selection type used by start_download.  The keys mirror the rungs of
+# height_to_label, so a single dict lookup replaces chained substring
+# tests (which also mis-ordered "4K" behind the generic fall-through).
+_LABEL_TO_TYPE = {
+    "Audio Only": "audio",
+    "4K": "video4K",
+    "2K": "video1440p",
+    "1440p": "video1440p",
+    "1080p": "video1080p",
+    "720p": "video720p",
+}
+
+
+def formats_from_info(info):
+    """
+    Builds the audio/video formats dictionary from a yt-dlp info dictionary.
+
+    Args:
+        info (dict): The info dictionary returned by YoutubeDL.extract_info.
+
+    Returns:
+        dict: A dictionary with audio and video formats; video entries are
+        (height, "fmtcode: label") tuples so callers can sort numerically.
+    """
+    formats = {"audio": None, "video": []}
+    seen_labels = set()
+    for fmt in info.get("formats") or []:
+        format_id = fmt.get("format_id")
+        vcodec = fmt.get("vcodec") or "none"
+        acodec = fmt.get("acodec") or "none"
+        if vcodec == "none":
+            if acodec != "none":
+                formats["audio"] = f"{format_id}: Audio Only"
+        else:
+            height = fmt.get("height")
+            # The download presets only distinguish 720p and up, so lower
+            # heights and repeat codec variants of the same rung would
+            # just pad the combo box with dead entries.
+            if height and height >= 720:
+                label = height_to_label(height)
+                if label not in seen_labels:
+                    seen_labels.add(label)
+                    formats["video"].append((height, f"{format_id}: {label}"))
+    return formats
+
+
+# Reusable probe instances, one per noplaylist setting (YoutubeDL params
+# are fixed at construction).  Only the format-probe worker touches these,
+# and at most one probe runs at a time, so no locking is needed.
+_probe_ydls = {}
+
+
+def _probe_ydl(playlist):
+    """
+    Returns a shared YoutubeDL instance configured for format probes.
+
+    Args:
+        playlist (bool): Whether playlist entries should be considered.
+
+    Returns:
+        YoutubeDL: A reusable instance; callers must not close it.
+    """
+    ydl = _probe_ydls.get(playlist)
+    if ydl is None:
+        import yt_dlp
+
+        ydl = _probe_ydls[playlist] = yt_dlp.YoutubeDL(
+            {
+                "quiet": True,
+                "no_warnings": True,
+                "skip_download": True,
+                "noplaylist": not playlist,
+                "cachedir": YTDLP_CACHE_DIR,
+                # Don't HEAD-probe every format URL just to list them; the
+                # picker only needs the metadata, and the probes multiply
+                # round-trips.
+                "check_formats": False,
+            }
+        )
+    return ydl
+
+
+def fetch_formats_with_api(url, playlist=False):
+    """
+    Fetches available formats in-process through yt-dlp's Python API.
+
+    Avoids spawning a yt-dlp subprocess (a full interpreter start plus
+    extractor imports per click) and works on structured format dicts
+    instead of scraping the human-readable -F table.
+
+    Args:
+        url (str): The URL to probe.
+        playlist (bool): Whether playlist entries should be considered.
+
+    Returns:
+        tuple: (formats dict, full info dictionary from extract_info).
+    """
+    info = _probe_ydl(playlist).extract_info(url, download=False)
+
+    format_source = info
+    if info.get("entries"):
+        # For playlists, the first entry's formats stand in for the rest.
+        format_source = info["entries"][0]
+    return formats_from_info(format_source), info
+
+
+def fetch_formats_with_cli(url, playlist=False):
+    """
+    Fetches available formats by running the yt-dlp CLI with -F.
+
+    Kept as a fallback for the API path, e.g. when an installed yt-dlp
+    binary is newer than the bundled library.
+
+    Args:
+        url (str): The URL to probe.
+        playlist (bool): Whether playlist entries should be considered.
+
+    Returns:
+        dict: A dictionary with audio and video formats.
+    """
+    import subprocess
+
+    command = ["yt-dlp", url, "-F"]
+    if playlist:
+        command.append("--lazy-playlist")
+    # No console window flashing up on Windows.
+    creationflags = (
+        subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+    )
+    # Stream the listing instead of buffering it whole: --lazy-playlist can
+    # emit one format table per playlist entry, and only the handful of
+    # matching rows ever need to live in memory.
+    proc = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+        bufsize=65536,
+        creationflags=creationflags,
+    )
+    # Drain stderr on its own thread while stdout streams; reading the two
+    # pipes sequentially deadlocks as soon as the child emits more than a
+    # pipe buffer of warnings (easy with --lazy-playlist).
+    stderr_chunks = []
+    stderr_reader = threading.Thread(
+        target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True
+    )
+    stderr_reader.start()
+    with proc:
+        formats = parse_formats(proc.stdout)
+        stderr_reader.join()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(
+            proc.returncode, command, stderr="".join(stderr_chunks)
+        )
+    return formats
+
+
+def warm_yt_dlp():
+    """
+    Imports yt_dlp and spins up one YoutubeDL instance.
+
+    Run on a background thread at startup so the import and the lazy
+    extractor registration happen while the user is still typing a URL,
+    instead of stalling the first format probe or download.
+    """
+    try:
+        import yt_dlp
+
+        with yt_dlp.YoutubeDL({"quiet": True}):
+            pass
+    except Exception:
+        # Warming is best-effort; a real call will surface any problem.
+        pass
+
+
 def normalize_filename(filename):
     """
     Normalizes the filename by removing suffixes like .f614 or .f140.
@@ -118,58 +500,57 @@ def normalize_filename(filename):
     Returns:
         str: The normalized filename.
     """
-    base, _ = os.path.splitext(filename)
-    # Remove suffixes like .f614 or .f140
-    base = base.rsplit(".", 1)[0]
-    return base
+    # Called from the progress path, so two rpartition calls stand in for
+    # os.path.splitext (which also pays for drive/separator handling we
+    # never need on a bare basename).
+    base = filename.rpartition(".")[0] or filename
+    return base.rpartition(".")[0] or base
+
 
+# Matches the -F rows worth keeping: "<code> <ext> <WxH|audio only> ...".
+# Header, storyboard, and footer rows fail the match and are skipped.  Only
+# the height half of the resolution is captured; the width is never used.
+_FMT_RE = re.compile(r"(\d+)\s+\w+\s+(?:\d+x(\d+)|audio only)")
 
-def parse_formats(output):
+
+def parse_formats(lines):
     """
-    Parses the output from yt-dlp to extract available formats.
+    Parses yt-dlp -F output lines to extract available formats.
 
     Args:
-        output (str): The format output from yt-dlp.
+        lines (iterable): The format listing, one string per line; a pipe
+            being read incrementally works as well as a list.
 
     Returns:
-        dict: A dictionary with audio and video formats.
+        dict: A dictionary with audio and video formats; video entries are
+        (height, "fmtcode: label") tuples so callers can sort numerically.
     """
-    lines = output.splitlines()
     formats = {"audio": None, "video": []}
 
-    def resolution_to_label(res):
-        width, height = map(int, res.split("x"))
-        if height >= 2160:
-            return "4K"
-        elif height >= 1440:
-            return "2K"
-        elif height >= 1080:
-            return "1080p"
-        elif height >= 720:
-            return "720p"
-        elif height >= 480:
-            return "480p"
-        else:
-            return "Low Resolution"
-
     for line in lines:
-        video_match = re.match(r"^(\d+)\s+\w+\s+(\d+x\d+)", line)
-        if video_match:
-            format_code = video_match.group(1)
-            video_resolution = video_match.group(
-                2
-            )  # Changed variable name from 'resolution'
-            label = resolution_to_label(video_resolution)
-            formats["video"].append(f"{format_code}: {label}")
-
-        audio_match = re.match(r"^(\d+)\s+\w+\s+audio only", line)
-        if audio_match:
-            format_code = audio_match.group(1)
+        match = _FMT_RE.match(line)
+        if not match:
+            continue
+        format_code, height = match.group(1, 2)
+        if height:
+            height = int(height)
+            formats["video"].append(
+                (height, f"{format_code}: {height_to_label(height)}")
+            )
+        else:
             formats["audio"] = f"{format_code}: Audio Only"
 
     return formats
 
 
+# Unit labels for format_bytes, indexed by power of 1024.
+_BYTE_LABELS = ("", "KB", "MB", "GB", "TB")
+
+# Reciprocal of one MiB: byte counts on the progress path are converted
+# with a multiply, which is cheaper than a division per tick.
+_INV_MIB = 1.0 / (1024 * 1024)
+
+
 def format_bytes(size):
     """
     Converts a byte size into a human-readable string with appropriate units.
@@ -180,14 +561,12 @@ def format_bytes(size):
     Returns:
         str: The size formatted as a human-readable string.
     """
-    # 2**10 = 1024
-    power = 2**10
-    n = 0
-    power_labels = {0: "", 1: "KB", 2: "MB", 3: "GB", 4: "TB"}
-    while size > power:
-        size /= power
-        n += 1
-    return f"{size:.2f} {power_labels[n]}"
+    if size <= 0:
+        return "0.00 "
+    # bit_length // 10 picks the power of 1024 directly, replacing the old
+    # divide-and-loop scan.
+    n = min(4, (int(size).bit_length() - 1) // 10)
+    return f"{size / (1 << (10 * n)):.2f} {_BYTE_LABELS[n]}"
 
 
 class MainWindow(QMainWindow):
@@ -209,10 +588,11 @@ class MainWindow(QMainWindow):
     Methods:
         __init__(self): Initializes the main window.
         clear_input(self): Clears the input fields and reset labels.
-        get_formats(self): Retrieves available formats for the provided URL.
+        get_formats(self): Starts a format probe for the provided URL.
+        on_formats_ready(self, formats, info): Receives a finished format probe.
+        on_format_error(self, message): Reports a failed format probe.
         populate_combo_box(self, formats): Populates the combo box with available formats.
         start_download(self): Starts the download process.
-        progress_hook(self, d): Handles download progress updates.
         update_progress(self): Updates the progress bar and labels with the download status.
         update_table(self): Updates the table with download details.
         comboChanged(self): Handles changes in the combo box selection.
@@ -222,6 +602,31 @@ class MainWindow(QMainWindow):
         open_download_folder(self): Opens the selected download folder in the file explorer.
     """
 
+    # How long (seconds) a cached format-probe info dictionary stays usable.
+    INFO_CACHE_TTL = 300
+
+    # Options shared by every download, assembled once at class load.
+    # start_download patches in the per-click fields (format, outtmpl,
+    # noplaylist).  1 MiB write buffer and 10 MiB HTTP range requests:
+    # fewer small writes to disk and fewer range round-trips on fast links
+    # than yt-dlp's defaults.
+    _BASE_OPTS = {
+        "cachedir": YTDLP_CACHE_DIR,
+        "buffersize": 1024 * 1024,
+        "http_chunk_size": 10 * 1024 * 1024,
+    }
+
+    # selectionType -> yt-dlp format string; the video presets all merge a
+    # best-audio stream.
+    _TYPE_TO_FORMAT = {
+        "audio": "bestaudio/best",
+        "video720p": "bestvideo[height<=720]+bestaudio",
+        "video1080p": "bestvideo[height=1080]+bestaudio",
+        "video1440p": "bestvideo[height=1440]+bestaudio",
+        "video2K": "bestvideo[height=1440]+bestaudio",
+        "video4K": "bestvideo[height=2160]+bestaudio",
+    }
+
     def __init__(self):
         """
         Initializes the main window and sets up the UI and connections.
@@ -236,21 +641,31 @@ class MainWindow(QMainWindow):
         self.file_size = None
         self.url = None
         self.current_row_position = None  # Track the current row being updated
+        # URL -> (info, probed-at) from format probes, reused by
+        # start_download while fresh enough.  Keyed per URL so hopping
+        # between a couple of videos doesn't evict anything.
+        self._info_cache = {}
+        # Normalized filename -> table row, so progress ticks find their row
+        # without scanning the whole table.
+        self._row_by_basename = {}
+        # Last values rendered into labels/cells, so unchanged ticks skip
+        # the setText/setItem (and the repaint each one triggers).
+        self._last_rendered = {}
+        # Raw filename from the last progress sample; normalization and the
+        # label update only happen when it changes.
+        self._last_hook_filename = None
+        # Byte count from the last rendered sample; a stalled download does
+        # no widget work at all.
+        self._last_downloaded = -1
+        # Integer percent last pushed to the progress bar; setValue emits
+        # valueChanged and repaints even for an unchanged value.
+        self._last_pct = -1
         loadUi("tube.ui", self)
 
-        create_db_dir()
         create_database_or_database_table(self.table)
 
-        self.last_update_time = time.time()
-        self.update_interval = 0.5
-
         self.download_data = {}
 
-        self.update_timer = QTimer()
-        self.update_timer.setInterval(int(self.update_interval * 1000))
-        self.update_timer.timeout.connect(self.update_progress)
-        self.update_timer.start()
-
         self.pushButton.clicked.connect(self.get_formats)
         self.comboBox.currentIndexChanged.connect(self.combo_changed)
         self.downloadButton.clicked.connect(self.start_download)
@@ -268,6 +683,9 @@ class MainWindow(QMainWindow):
         # Initialize table with existing entries from the database
         self.initialize_table_from_database()
 
+        # Pull the yt_dlp import cost forward while the window is idle.
+        threading.Thread(target=warm_yt_dlp, daemon=True).start()
+
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
 
@@ -276,26 +694,43 @@ class MainWindow(QMainWindow):
         Initializes the table widget with existing entries from the database.
         """
         table_name = self.table
-        entries = fetch_entries_from_database(table_name)
-
-        if entries:
-            # Exclude the 'id' column from the table
-            num_columns = len(entries[0]) - 1  # Exclude 'id' column
-            self.tableWidget.setRowCount(len(entries))
-            self.tableWidget.setColumnCount(num_columns)
-
-            for row_idx, row_data in enumerate(entries):
-                for col_idx, cell_data in enumerate(
-                    row_data[1:]
-                ):  # Skip the first column (id)
+        self.tableWidget.setRowCount(0)
+        self.tableWidget.setColumnCount(5)
+        self._row_by_basename.clear()
+
+        # Suspend repaints and sorting while the table fills; otherwise every
+        # setItem triggers a layout/paint pass.  Sorting is restored to its
+        # prior state (off by default) rather than forced on: enabling it
+        # would immediately re-sort the rows and keep relocating them under
+        # the cached row indexes on every later filename write.
+        self.tableWidget.setUpdatesEnabled(False)
+        was_sorting = self.tableWidget.isSortingEnabled()
+        self.tableWidget.setSortingEnabled(False)
+        try:
+            # Rows are streamed from the database, so the history never has
+            # to fit in memory as one list.
+            for row_idx, row_data in enumerate(iter_entries_from_database(table_name)):
+                filename, file_size, status, time_left, transfer_rate = row_data
+                # The database stores native numbers (bytes, seconds,
+                # bytes/s); they are formatted for display here.
+                display_values = (
+                    filename,
+                    format_bytes(file_size or 0),
+                    status,
+                    str(timedelta(seconds=time_left))
+                    if time_left is not None
+                    else "N/A",
+                    f"{(transfer_rate or 0) * _INV_MIB:.2f} MB/s",
+                )
+                self.tableWidget.insertRow(row_idx)
+                self._row_by_basename[normalize_filename(filename)] = row_idx
+                for col_idx, cell_data in enumerate(display_values):
                     self.tableWidget.setItem(
                         row_idx, col_idx, QTableWidgetItem(str(cell_data))
                     )
-        else:
-            self.tableWidget.setRowCount(0)  # No entries found
-            self.tableWidget.setColumnCount(
-                5
-            )  # Set column count if needed, e.g., 5 columns
+        finally:
+            self.tableWidget.setSortingEnabled(was_sorting)
+            self.tableWidget.setUpdatesEnabled(True)
 
     def clear_input(self):
         """
@@ -303,19 +738,18 @@ class MainWindow(QMainWindow):
         """
         self.lineEdit.clear()
         self.comboBox.clear()
+        self._last_pct = 0
         self.progressBar.setValue(0)
         self.downloadedLabel.setText("Downloaded: 0 MB")
         self.fileSizeLabel.setText("File Size: 0 MB")
         self.fileNameLabel.setText("File Name: None")
 
-        # Stop the update timer to prevent immediate UI updates with old values
-        self.update_timer.stop()
-
         # Clear download data
         self.download_data = {}
-
-        # Restart the timer if needed (optional, depending on your application's logic)
-        self.update_timer.start()
+        # Forget the last hook filename too, or re-downloading the same
+        # file would skip the label update and leave the reset text above
+        # in place.
+        self._last_hook_filename = None
 
     def get_highlighted_filenames(self):
         """
@@ -365,9 +799,17 @@ class MainWindow(QMainWindow):
         for row in sorted(selected_rows, reverse=True):
             self.tableWidget.removeRow(row.row())
 
+        self._last_rendered.clear()
+        # Row numbers after the deleted rows have shifted; rebuild the index.
+        self._row_by_basename = {
+            normalize_filename(self.tableWidget.item(row, 0).text()): row
+            for row in range(self.tableWidget.rowCount())
+            if self.tableWidget.item(row, 0) is not None
+        }
+
     def get_formats(self):
         """
-        Retrieves available formats for the entered URL using yt-dlp.
+        Retrieves available formats for the entered URL on a worker thread.
         """
         self.url = self.lineEdit.text().strip()
 
@@ -375,25 +817,56 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Input Error", "Please enter a valid URL.")
             return
 
+        playlist = self.playlistCheckBox.isChecked()
+
+        if not playlist:
+            cached = self._info_cache.get(self.url)
+            if cached is not None:
+                info, cached_at = cached
+                if time.monotonic() - cached_at < self.INFO_CACHE_TTL:
+                    # A recent probe already fetched this URL; serving it
+                    # is a dict lookup instead of another extraction.
+                    self.populate_combo_box(formats_from_info(info))
+                    return
+                del self._info_cache[self.url]
+
         self.pushButton.setEnabled(False)
 
-        # Prepare yt-dlp command with playlist options
-        command = ["yt-dlp", self.url, "-F"]
+        self.format_worker = FormatFetchWorker(self.url, playlist)
+        self.format_worker.result.connect(self.on_formats_ready)
+        self.format_worker.error.connect(self.on_format_error)
+        self.format_worker.start()
 
-        # Add --lazy-playlist option if playlist checkbox is checked
-        if self.playlistCheckBox.isChecked():
-            command.append("--lazy-playlist")
+    def on_formats_ready(self, formats, info):
+        """
+        Populates the combo box once the format probe finishes.
 
-        try:
-            result = subprocess.run(command, capture_output=True, text=True, check=True)
-            output = result.stdout
-            formats = parse_formats(output)
-            self.populate_combo_box(formats)
-        except subprocess.CalledProcessError as e:
-            output = f"An error occurred: {e.stderr}"
-            QMessageBox.critical(self, "Error", output)
-        finally:
-            self.pushButton.setEnabled(True)
+        Args:
+            formats (dict): A dictionary of available formats.
+            info (dict): The probe's info dictionary, or None for the CLI
+                fallback path.
+        """
+        if info is not None and not info.get("entries"):
+            # Remember the probe result so start_download doesn't
+            # re-extract the same URL moments later.
+            now = time.monotonic()
+            self._info_cache[self.url] = (info, now)
+            # Expired entries are only dead weight; drop them while here.
+            for cached_url, (_, cached_at) in list(self._info_cache.items()):
+                if now - cached_at >= self.INFO_CACHE_TTL:
+                    del self._info_cache[cached_url]
+        self.populate_combo_box(formats)
+        self.pushButton.setEnabled(True)
+
+    def on_format_error(self, message):
+        """
+        Reports a failed format probe.
+
+        Args:
+            message (str): The error message from the worker.
+        """
+        QMessageBox.critical(self, "Error", f"An error occurred: {message}")
+        self.pushButton.setEnabled(True)
 
     def populate_combo_box(self, formats):
         """
@@ -402,18 +875,37 @@ class MainWindow(QMainWindow):
         Args:
             formats (dict): A dictionary of available formats.
         """
-        self.comboBox.clear()
-        self.comboBox.addItem("Select Format")
-        self.comboBox.setItemData(0, Qt.AlignCenter, Qt.TextAlignmentRole)
-        self.comboBox.setItemData(0, False, Qt.UserRole - 1)
+        items = ["Select Format"]
         if formats["audio"]:
-            self.comboBox.addItem(formats["audio"])
-
-        sorted_videos = sorted(
-            formats["video"], key=lambda x: x.split(":")[1], reverse=True
+            items.append(formats["audio"])
+        # Sorting on the height int is both faster than comparing labels
+        # and correct ("1080p" sorted lexically lands below "720p").
+        items.extend(
+            entry
+            for height, entry in sorted(
+                formats["video"], key=itemgetter(0), reverse=True
+            )
         )
-        for video in sorted_videos:
-            self.comboBox.addItem(video)
+
+        # One addItems call gives the view a single model notification
+        # instead of one per entry, and blocked signals keep the repopulation
+        # from firing combo_changed once per insert.
+        self.comboBox.blockSignals(True)
+        try:
+            self.comboBox.clear()
+            self.comboBox.addItems(items)
+            self.comboBox.setItemData(0, Qt.AlignCenter, Qt.TextAlignmentRole)
+            self.comboBox.setItemData(0, False, Qt.UserRole - 1)
+            # The format code rides along as userData so currentData() can
+            # hand it to anything wanting the exact stream, not the preset.
+            for index in range(1, self.comboBox.count()):
+                self.comboBox.setItemData(
+                    index, self.comboBox.itemText(index).split(":", 1)[0]
+                )
+        finally:
+            self.comboBox.blockSignals(False)
+        # Re-sync selectionType with the placeholder now showing.
+        self.combo_changed()
 
     def start_download(self):
         """
@@ -433,102 +925,151 @@ class MainWindow(QMainWindow):
 
         download_playlist = self.playlistCheckBox.isChecked()
 
-        # Define options for yt-dlp based on selection type
+        selected_format = self._TYPE_TO_FORMAT.get(self.selectionType)
+        if selected_format is None:
+            QMessageBox.warning(self, "Selection Error", "Invalid selection type.")
+            return
+
+        # The static options live in the class-scope template; only the
+        # per-click fields are filled in here.
         ydl_opts = {
-            "format": "",  # Default value, will be set based on selection type
-            "outtmpl": "%(title)s.%(ext)s",  # Output filename template
-            "progress_hooks": [self.progress_hook],  # Add progress hook
+            **self._BASE_OPTS,
+            "format": selected_format,
+            # Output filename template, anchored to the chosen folder
+            "outtmpl": os.path.join(
+                self.download_folder or os.getcwd(), "%(title)s.%(ext)s"
+            ),
+            "noplaylist": not download_playlist,
         }
 
-        if download_playlist:
-            ydl_opts["noplaylist"] = False  # Include playlists if checkbox is checked
-        else:
-            ydl_opts["noplaylist"] = True  # Exclude playlists otherwise
-
-        # Set format options based on the selected format type
-        if self.selectionType == "audio":
-            ydl_opts["format"] = "bestaudio/best"  # Download the best audio format
-        elif self.selectionType == "video720p":
-            ydl_opts["format"] = (
-                "bestvideo[height<=720]+bestaudio"  # Best video up to 720p with audio
-            )
-        elif self.selectionType == "video1080p":
-            ydl_opts["format"] = (
-                "bestvideo[height=1080]+bestaudio"  # Best video at 1080p with audio
-            )
-        elif self.selectionType == "video1440p":
-            ydl_opts["format"] = (
-                "bestvideo[height=1440]+bestaudio"  # Best video at 1440p with audio
-            )
-        elif self.selectionType == "video2K":
-            ydl_opts["format"] = (
-                "bestvideo[height=1440]+bestaudio"  # Best video at 2K (1440p) with audio
-            )
-        elif self.selectionType == "video4K":
-            ydl_opts["format"] = (
-                "bestvideo[height=2160]+bestaudio"  # Best video at 4K (2160p) with audio
-            )
-        else:
-            QMessageBox.warning(self, "Selection Error", "Invalid selection type.")
-            return
+        if self.selectionType != "audio":
+            # Pin the merge container so the single merge pass yt-dlp
+            # already runs produces the .mp4 the worker's filename
+            # heuristic expects.  No extra postprocessors: each one is a
+            # separate full-copy ffmpeg invocation over the output file.
+            ydl_opts["merge_output_format"] = "mp4"
+
+        # Reuse the info from the format probe while it is fresh; signed
+        # format URLs go stale, so cached metadata expires after a few
+        # minutes and the worker re-extracts instead.
+        info = None
+        cached = self._info_cache.get(url)
+        if cached is not None:
+            cached_info, cached_at = cached
+            if time.monotonic() - cached_at < self.INFO_CACHE_TTL:
+                info = cached_info
+            else:
+                del self._info_cache[url]
 
         # Start the download operation in a separate thread
-        self.download_thread = DownloadWorker(url, ydl_opts)
-        self.download_thread.progress.connect(self.progress_hook)
+        self.download_thread = DownloadWorker(url, ydl_opts, info)
+        self.download_thread.progress_throttled.connect(self.update_progress)
         self.download_thread.finished.connect(self.on_download_finished)
         self.download_thread.error.connect(self.on_download_error)
         self.download_thread.start()
         self.downloadButton.setEnabled(False)
 
-    def progress_hook(self, d):
+    def update_progress(self, sample=None):
         """
-        Updates the progress bar and other UI elements based on download progress.
+        Updates the UI elements with download information.
+
+        Driven by the worker's throttled progress signal, so no work happens
+        while nothing is downloading.  All formatting and widget traffic
+        lives here, on the GUI thread; the worker side only stashes the
+        latest sample.
 
         Args:
-            d (dict): Progress information from yt-dlp.
+            sample (dict, optional): The progress dictionary from the worker.
         """
-        self.download_data = d
-
-        if "filename" in d:
-            filename = d["filename"]  # Get the actual filename from the dictionary
-            cleaned_filename = normalize_filename(filename)
-            self.fileNameLabel.setText(f"Downloading: {cleaned_filename}")
-        if d["status"] == "downloading":
-            self.file_size = d.get("total_bytes", d.get("total_bytes_estimate", 0))
-            self.downloaded_bytes = d.get("downloaded_bytes", 0)
-            self.transfer_rate = d.get("speed", 0)
-            self.eta = d.get("eta", 0)
-            self.status = "Downloading"
-
-        elif d["status"] == "finished":
-            self.file_size = d.get("total_bytes", d.get("total_bytes_estimate", 0))
-            self.downloaded_bytes = self.file_size
-            self.transfer_rate = 0
-            self.eta = 0
-            self.status = "Finished"
+        if sample is None and self.download_thread is not None:
+            sample = self.download_thread.latest
+        if sample is not None:
+            self.download_data = sample
+
+            if "filename" in sample:
+                filename = sample["filename"]
+                # The filename only changes between files; a string compare
+                # is far cheaper than re-normalizing and repainting the
+                # label on every sample.
+                if filename != self._last_hook_filename:
+                    self._last_hook_filename = filename
+                    cleaned_filename = normalize_filename(filename)
+                    self.fileNameLabel.setText(f"Downloading: {cleaned_filename}")
+            if sample["status"] == "downloading":
+                self.file_size = sample.get(
+                    "total_bytes", sample.get("total_bytes_estimate", 0)
+                )
+                self.downloaded_bytes = sample.get("downloaded_bytes", 0)
+                self.transfer_rate = sample.get("speed", 0)
+                self.eta = sample.get("eta", 0)
+                self.status = "Downloading"
+            elif sample["status"] == "finished":
+                self.file_size = sample.get(
+                    "total_bytes", sample.get("total_bytes_estimate", 0)
+                )
+                self.downloaded_bytes = self.file_size
+                self.transfer_rate = 0
+                self.eta = 0
+                self.status = "Finished"
 
-    def update_progress(self):
-        """
-        Periodically updates the UI elements with download information.
-        """
         if not self.download_data:
             # No active download, reset the progress bar and labels
+            self._last_pct = 0
             self.progressBar.setValue(0)
             self.downloadedLabel.setText("Downloaded: 0 MB")
             self.fileSizeLabel.setText("File Size: 0 MB")
             return
         downloaded_bytes = self.download_data.get("downloaded_bytes", 0)
+        # Nothing moved since the last render (stalled download, gap
+        # between fragments): skip the widget traffic entirely.  Terminal
+        # statuses still fall through so the final state is drawn.
+        if (
+            downloaded_bytes == self._last_downloaded
+            and self.download_data.get("status") == "downloading"
+        ):
+            return
+        self._last_downloaded = downloaded_bytes
         total_bytes = self.download_data.get(
-            "total_bytes", self.download_data.get("total_bytes_estimate", 1)
+            "total_bytes", self.download_data.get("total_bytes_estimate", 0)
         )
-        self.downloadedLabel.setText(f"{downloaded_bytes / (1024 * 1024):.2f} MB")
-        self.fileSizeLabel.setText(f"{total_bytes / (1024 * 1024):.2f} MB")
-        percent = downloaded_bytes / total_bytes * 100 if total_bytes else 0
-        self.progressBar.setValue(min(max(int(percent), 0), 100))
+        # Re-render the byte labels only when they moved by a whole MB.
+        label_key = (int(downloaded_bytes) >> 20, int(total_bytes) >> 20)
+        if self._last_rendered.get("labels") != label_key:
+            self._last_rendered["labels"] = label_key
+            self.downloadedLabel.setText(f"{downloaded_bytes * _INV_MIB:.2f} MB")
+            self.fileSizeLabel.setText(f"{total_bytes * _INV_MIB:.2f} MB")
+        percent = self._download_percent(downloaded_bytes, total_bytes)
+        pct = min(max(int(percent), 0), 100)
+        if pct != self._last_pct:
+            self._last_pct = pct
+            self.progressBar.setValue(pct)
 
         if self.download_data.get("status") != "finished":
             self.update_table()  # Call the update_table method only if download is not finished
 
+    def _download_percent(self, downloaded_bytes, total_bytes):
+        """
+        Computes the download percentage for the current sample.
+
+        Fragmented (HLS/DASH) downloads often report no byte total at all;
+        the fragment position still gives a usable percentage, instead of a
+        bar that sits at zero for the whole download.
+
+        Args:
+            downloaded_bytes (int): Bytes downloaded so far.
+            total_bytes (int): Known or estimated total size, possibly 0.
+
+        Returns:
+            float: The completion percentage, 0 when nothing is known.
+        """
+        if total_bytes:
+            return downloaded_bytes / total_bytes * 100
+        fragment_count = self.download_data.get("fragment_count")
+        if fragment_count:
+            fragment_index = self.download_data.get("fragment_index") or 0
+            return fragment_index / fragment_count * 100
+        return 0.0
+
     def update_table(self):
         """
         Updates the table with download details.
@@ -536,17 +1077,17 @@ class MainWindow(QMainWindow):
         if self.download_data:
             downloaded_bytes = self.download_data.get("downloaded_bytes", 0)
             total_bytes = self.download_data.get(
-                "total_bytes", self.download_data.get("total_bytes_estimate", 1)
+                "total_bytes", self.download_data.get("total_bytes_estimate", 0)
             )
-            percent = downloaded_bytes / total_bytes * 100 if total_bytes else 0
-            transfer_rate = self.download_data.get("speed", 0)
+            percent = self._download_percent(downloaded_bytes, total_bytes)
+            transfer_rate = self.download_data.get("speed") or 0
 
             # File size in MB
-            file_size_mb = total_bytes / (1024 * 1024)
+            file_size_mb = total_bytes * _INV_MIB
             file_size_str = f"{file_size_mb:.2f} MB"
 
             # Transfer rate in MB/s
-            transfer_rate_mb_s = transfer_rate / (1024 * 1024)
+            transfer_rate_mb_s = transfer_rate * _INV_MIB
             transfer_rate_str = f"{transfer_rate_mb_s:.2f} MB/s"
 
             # Download status
@@ -568,55 +1109,66 @@ class MainWindow(QMainWindow):
             filename = self.fileNameLabel.text().replace("Downloading: ", "").strip()
             base_filename = normalize_filename(filename)
 
-            row_count = self.tableWidget.rowCount()
-            row_position = -1
-            for row in range(row_count):
-                item = self.tableWidget.item(row, 0)
-                if item is not None:
-                    item_text = item.text()
-                    item_base_filename = normalize_filename(item_text)
-
-                    if item_base_filename == base_filename:
-                        row_position = row
-                        break
+            # O(1) lookup instead of scanning every row per tick
+            row_position = self._row_by_basename.get(base_filename, -1)
 
             # If not found, add a new row
-            if row_position == -1:
+            new_row = row_position == -1
+            if new_row:
                 row_position = self.tableWidget.rowCount()
                 self.tableWidget.insertRow(row_position)
+                self._row_by_basename[base_filename] = row_position
                 self.current_row_position = (
                     row_position  # Store the current row position
                 )
 
-            # Set or update the row with the new values
-            self.tableWidget.setItem(row_position, 0, QTableWidgetItem(filename))
-            self.tableWidget.setItem(row_position, 1, QTableWidgetItem(file_size_str))
-            self.tableWidget.setItem(row_position, 2, QTableWidgetItem(download_status))
-            self.tableWidget.setItem(row_position, 3, QTableWidgetItem(time_left))
-            self.tableWidget.setItem(
-                row_position, 4, QTableWidgetItem(transfer_rate_str)
-            )
+            # Set or update the row, touching only the cells whose rendered
+            # value actually changed since the last tick.
+            cells = (filename, file_size_str, download_status, time_left, transfer_rate_str)
+            cached = self._last_rendered.setdefault(("row", row_position), [None] * 5)
+            if new_row:
+                # The first fill writes all five cells; suspend repaints so
+                # the row appears in one paint pass instead of five.  Steady
+                # ticks touch at most a cell or two and skip the batching,
+                # since re-enabling updates itself forces a repaint.
+                self.tableWidget.setUpdatesEnabled(False)
+            try:
+                for col, value in enumerate(cells):
+                    if cached[col] != value:
+                        cached[col] = value
+                        self._set_cell(row_position, col, value)
+            finally:
+                if new_row:
+                    self.tableWidget.setUpdatesEnabled(True)
+
+    def _set_cell(self, row, col, text):
+        """
+        Writes text into a table cell, reusing the existing item.
+
+        setText on an existing QTableWidgetItem avoids allocating a fresh
+        QObject (and the model reset that setItem triggers) on every
+        progress tick; a new item is only built the first time a cell is
+        touched.
+
+        Args:
+            row (int): The table row.
+            col (int): The table column.
+            text (str): The text to display.
+        """
+        item = self.tableWidget.item(row, col)
+        if item is None:
+            self.tableWidget.setItem(row, col, QTableWidgetItem(text))
+        else:
+            item.setText(text)
 
     def combo_changed(self):
         """
         Handles changes in the combo box selection.
         """
         selected_text = self.comboBox.currentText()
-        if selected_text:
-            if "Audio Only" in selected_text:
-                self.selectionType = "audio"
-            elif "1440p" in selected_text or "2K" in selected_text:
-                self.selectionType = "video1440p"
-            elif "1080p" in selected_text:
-                self.selectionType = "video1080p"
-            elif "720p" in selected_text:
-                self.selectionType = "video720p"
-            elif "4K" in selected_text:
-                self.selectionType = "video4K"
-            else:
-                self.selectionType = "unknown"
-        else:
-            self.selectionType = "unknown"
+        # Entries are "fmtcode: label"; the label alone keys the mapping.
+        label = selected_text.split(": ", 1)[-1]
+        self.selectionType = _LABEL_TO_TYPE.get(label, "unknown")
 
     def on_download_finished(self, merged_filename=None):
         """
@@ -635,8 +1187,16 @@ class MainWindow(QMainWindow):
             else:
                 filename = merged_filename
 
-            if os.path.exists(filename):
-                file_size_bytes = os.path.getsize(filename)
+            # The file lands in the chosen download folder, not the CWD.
+            # One stat covers both the existence check and the size.
+            filepath = os.path.join(self.download_folder or os.getcwd(), filename)
+            try:
+                stat_result = os.stat(filepath)
+            except FileNotFoundError:
+                stat_result = None
+
+            if stat_result is not None:
+                file_size_bytes = stat_result.st_size
                 file_size_mb = file_size_bytes / (1024 * 1024)  # Convert bytes to MB
                 file_size_gb = file_size_bytes / (
                     1024 * 1024 * 1024
@@ -652,32 +1212,24 @@ class MainWindow(QMainWindow):
                 # Use the current row position to update the row
                 row_position = self.current_row_position
                 if row_position is not None:
-                    self.tableWidget.setItem(
-                        row_position, 0, QTableWidgetItem(filename)
-                    )
-                    self.tableWidget.setItem(
-                        row_position, 1, QTableWidgetItem(file_size_str)
-                    )
-                    self.tableWidget.setItem(
-                        row_position, 2, QTableWidgetItem("Completed")
-                    )
-                    self.tableWidget.setItem(row_position, 3, QTableWidgetItem("N/A"))
-                    self.tableWidget.setItem(
-                        row_position, 4, QTableWidgetItem("0.00 MB/S")
-                    )
-
-                # Add the completed download to the database
-                download_status = "Completed"
-                time_left = "N/A"  # Time left is not available after download
-                transfer_rate = (
-                    "0.00 MB/S"  # Transfer rate is not available after download
-                )
-                add_file_to_database_table(
+                    self._row_by_basename[normalize_filename(filename)] = row_position
+                    self._set_cell(row_position, 0, filename)
+                    self._set_cell(row_position, 1, file_size_str)
+                    self._set_cell(row_position, 2, "Completed")
+                    self._set_cell(row_position, 3, "N/A")
+                    self._set_cell(row_position, 4, "0.00 MB/S")
+
+                # Add the completed download to the database; numeric values
+                # are stored raw and formatted only for display.  The write
+                # goes through the DB worker thread so a slow fsync cannot
+                # stall the GUI right as the "finished" dialog appears.
+                submit_db_task(
+                    add_file_to_database_table,
                     filename,
-                    file_size_str,
-                    download_status,
-                    time_left,
-                    transfer_rate,
+                    file_size_bytes,
+                    "Completed",
+                    None,  # Time left is not available after download
+                    0.0,  # Transfer rate is not available after download
                     "completed_downloads",
                 )
 
@@ -711,10 +1263,10 @@ class MainWindow(QMainWindow):
         try:
             savedir = QFileDialog.getExistingDirectory(self, "Select Download Folder")
             if savedir:  # Check if the user did not cancel the dialog
-                os.chdir(savedir)
-                dirpath = os.path.basename(os.getcwd())
-                save_path = dirpath
-                self.label.setText(f"Destination Folder = {save_path}")
+                # No os.chdir: the folder is threaded through outtmpl instead
+                # of mutating process-global state, so concurrent downloads
+                # to different folders stay possible.
+                self.label.setText(f"Destination Folder = {os.path.basename(savedir)}")
                 self.download_folder = savedir
             else:
                 raise ValueError("No directory selected.")
@@ -725,6 +1277,8 @@ class MainWindow(QMainWindow):
         """
         Opens the selected download folder in the file explorer.
         """
+        import subprocess
+
         if self.download_folder:
             if sys.platform == "win32":
                 os.startfile(self.download_folder)